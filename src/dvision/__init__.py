@@ -16,15 +16,20 @@ from .config import (
 )
 from .camera import Camera
 from .database import FaceDatabase, Person
+from .encoding import BatchEncoder
 from .recognition import FaceRecognizer
 from .ui import Overlay
+from .unknowns import UnknownCluster, UnknownFaceCache
 
 __all__ = [
     "Camera",
     "FaceDatabase",
     "Person",
     "FaceRecognizer",
+    "BatchEncoder",
     "Overlay",
+    "UnknownCluster",
+    "UnknownFaceCache",
     "RECOGNITION_TOLERANCE",
     "SEEN_COOLDOWN_SECONDS",
     "DEFAULT_CAMERA_INDEX",
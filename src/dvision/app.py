@@ -9,22 +9,25 @@ Usage:
     python -m dvision                       # Run face recognition
     python -m dvision --add-face --name "Name" # Add a new face
     python -m dvision --camera-index 1      # Use different camera
+    python -m dvision --review-unknowns     # Name recurring strangers on exit
+    python -m dvision --benchmark-encoding 8  # Encoding throughput, batch 1..8
 """
 
 import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
 
 from .camera import Camera
 from .config import DEFAULT_DB_PATH, RECOGNITION_SKIP_FRAMES
-from .database import FaceDatabase
+from .database import FaceDatabase, Person
 from .recognition import FaceRecognizer
 from .ui import Overlay
+from .unknowns import UnknownFaceCache
 
 # Configure logging
 logging.basicConfig(
@@ -63,6 +66,17 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Name for the person (required with --add-face)",
     )
+    parser.add_argument(
+        "--review-unknowns",
+        action="store_true",
+        help="Prompt to name recurring unknown faces when recognition ends",
+    )
+    parser.add_argument(
+        "--benchmark-encoding",
+        type=int,
+        metavar="N",
+        help="Report face encoding throughput for batch sizes 1 through N",
+    )
 
     return parser.parse_args()
 
@@ -133,10 +147,102 @@ def add_face_flow(
         logger.info("No face captured → Nothing saved")
 
 
+def benchmark_encoding_flow(
+    camera: Camera,
+    recognizer: FaceRecognizer,
+    max_batch_size: int,
+) -> None:
+    """
+    Measure batched encoding throughput on faces from the live camera.
+
+    Waits for at least one face, then times the descriptor network for
+    batch sizes 1 through ``max_batch_size`` (chips are repeated to fill
+    larger batches) and logs faces per second for each.
+
+    Args:
+        camera: Camera instance for video capture.
+        recognizer: FaceRecognizer providing detection and the encoder.
+        max_batch_size: Largest batch size to measure.
+    """
+    logger.info("Benchmark mode: Look at the camera.")
+    chips: list = []
+
+    while not chips:
+        ok, frame = camera.read()
+        if not ok or frame is None:
+            continue
+        rgb = np.ascontiguousarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        boxes = recognizer.detect_faces(rgb)
+        if boxes:
+            chips = recognizer.encoder.extract_chips(rgb, boxes)
+
+    logger.info(
+        "Captured %d face(s); timing batch sizes 1-%d", len(chips), max_batch_size
+    )
+    results = recognizer.encoder.benchmark(chips, max_batch_size)
+    baseline = results[1]
+    for size, faces_per_sec in results.items():
+        logger.info(
+            "batch %2d: %7.1f faces/s (%.2fx)",
+            size, faces_per_sec, faces_per_sec / baseline,
+        )
+
+
+def identify(
+    db: FaceDatabase,
+    unknowns: UnknownFaceCache,
+    encoding: np.ndarray,
+) -> Tuple[Optional[Person], float]:
+    """
+    Match an encoding, consulting the unknown-face cache first.
+
+    Encodings that fall in a recently verified unknown cluster skip the
+    database search entirely; failed searches are fed back into the cache.
+    """
+    revision = db.revision
+    cluster = unknowns.match(encoding, revision)
+    if cluster is not None:
+        return None, cluster.best_conf
+
+    person, conf = db.lookup(encoding)
+    if person is None:
+        unknowns.add(encoding, conf, revision)
+    return person, conf
+
+
+def review_unknowns_flow(db: FaceDatabase, unknowns: UnknownFaceCache) -> None:
+    """
+    Prompt for names of recurring unknown faces and enroll them in bulk.
+
+    Leave a name blank to skip that face.
+    """
+    candidates = unknowns.candidates()
+    if not candidates:
+        logger.info("No recurring unknown faces to review")
+        return
+
+    logger.info("Reviewing %d unknown face(s)", len(candidates))
+    names: Dict[int, str] = {}
+    relations: Dict[int, str] = {}
+    for cluster in candidates:
+        name = input(
+            f"Unknown #{cluster.cluster_id} (seen {cluster.sightings}x) name: "
+        ).strip()
+        if not name:
+            continue
+        names[cluster.cluster_id] = name
+        relations[cluster.cluster_id] = input(f"Relation of {name} to user: ").strip()
+
+    for person in unknowns.enroll(db, names, relations):
+        logger.info("✔ Added %s (%s)", person.name, person.relation)
+    db.save()
+
+
 def recognition_loop(
     camera: Camera,
     recognizer: FaceRecognizer,
     db: FaceDatabase,
+    unknowns: Optional[UnknownFaceCache] = None,
 ) -> None:
     """
     Main recognition loop - continuously detect and identify faces.
@@ -144,17 +250,22 @@ def recognition_loop(
     Uses skip-frame processing to reduce CPU load: only runs face
     detection/encoding every Nth frame (configured by RECOGNITION_SKIP_FRAMES).
     Cached results are displayed on skipped frames for smooth video.
+    Faces that repeatedly fail to match are remembered in an unknown-face
+    cache so the database search is not rerun for them every frame.
     
     Args:
         camera: Camera instance for video capture.
         recognizer: FaceRecognizer for detection and encoding.
         db: FaceDatabase for matching faces.
+        unknowns: Cache of unmatched faces (a fresh one if omitted).
     """
     logger.info(
         "Recognition loop started (skip-frame: %d). Press 'q' to quit.",
         RECOGNITION_SKIP_FRAMES
     )
     overlay = Overlay()
+    if unknowns is None:
+        unknowns = UnknownFaceCache()
     
     # Skip-frame processing state
     frame_counter = 0
@@ -177,7 +288,7 @@ def recognition_loop(
                 # Match each detected face against the database
                 matches = []
                 for enc in encodings:
-                    person, conf = db.lookup(enc)
+                    person, conf = identify(db, unknowns, enc)
                     matches.append((person, conf))
                 cached_boxes, cached_matches = boxes, matches
             else:
@@ -209,6 +320,9 @@ def main() -> None:
     if opts.add_face and not opts.name:
         logger.error("--name is required with --add-face")
         sys.exit(1)
+    if opts.benchmark_encoding is not None and opts.benchmark_encoding < 1:
+        logger.error("--benchmark-encoding must be at least 1")
+        sys.exit(1)
 
     # Initialize components
     db = FaceDatabase(opts.db_path)
@@ -221,16 +335,26 @@ def main() -> None:
         sys.exit(1)
 
     rec = FaceRecognizer()
+    unknowns = UnknownFaceCache()
 
     try:
         if opts.add_face:
             add_face_flow(cam, rec, db, opts.name)
+        elif opts.benchmark_encoding is not None:
+            benchmark_encoding_flow(cam, rec, opts.benchmark_encoding)
         else:
-            recognition_loop(cam, rec, db)
+            try:
+                recognition_loop(cam, rec, db, unknowns)
+            except KeyboardInterrupt:
+                logger.info("User interrupted")
+            cv2.destroyAllWindows()
+            if opts.review_unknowns:
+                review_unknowns_flow(db, unknowns)
     except KeyboardInterrupt:
         logger.info("User interrupted")
     finally:
         db.save()
+        rec.close()
         cam.release()
         cv2.destroyAllWindows()
         logger.info("Shutdown complete")
@@ -12,6 +12,22 @@ from pathlib import Path
 # =============================================================================
 RECOGNITION_TOLERANCE: float = 0.91  # Minimum confidence for positive match
 SEEN_COOLDOWN_SECONDS: int = 60      # Cooldown before incrementing seen_count
+EMBEDDING_DIM: int = 128             # dlib face descriptor length
+
+# =============================================================================
+# Face Database
+# =============================================================================
+MIN_EMBEDDING_CAPACITY: int = 16     # Initial rows in the embedding matrix
+                                     # (capacity doubles when full)
+
+# =============================================================================
+# Unknown-Face Cache
+# =============================================================================
+UNKNOWN_CLUSTER_TOLERANCE: float = 0.95  # Min similarity to join an unknown cluster
+                                         # (stricter than RECOGNITION_TOLERANCE)
+UNKNOWN_CACHE_TTL_SECONDS: int = 10      # Max time between full gallery searches
+UNKNOWN_CACHE_SIZE: int = 32             # Max clusters kept in memory
+UNKNOWN_MIN_SIGHTINGS: int = 5           # Sightings before offered for enrollment
 
 # =============================================================================
 # Performance Tuning
@@ -19,6 +35,18 @@ SEEN_COOLDOWN_SECONDS: int = 60      # Cooldown before incrementing seen_count
 RECOGNITION_SKIP_FRAMES: int = 2     # Process every Nth frame (1=all, 2=half, 3=third)
                                      # Higher values = better FPS, slower detection
 
+# Region-of-interest detection: search only around last pass's faces
+ROI_DETECTION_ENABLED: bool = True
+ROI_PADDING: float = 0.5             # Padding per side, as a fraction of box size
+ROI_FULL_SWEEP_INTERVAL: int = 10    # Full-frame detection every Nth pass
+ROI_TILE_SIZE: int = 64              # ROI crops are resized to this square size
+ROI_MOSAIC_COLUMNS: int = 2          # Tiles per detector call = columns squared
+                                     # (2 x 64px fills the 128px short-range input)
+
+# Batched encoding: aligned face chips share descriptor network calls
+ENCODING_MAX_BATCH_SIZE: int = 8     # Max chips per network call
+ENCODING_MAX_WAIT_MS: float = 20.0   # Max wait for a cross-frame batch to fill
+
 # =============================================================================
 # Camera Settings
 # =============================================================================
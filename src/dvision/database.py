@@ -7,14 +7,20 @@ Uses JSON for simplicity and portability on resource-constrained devices.
 
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, NamedTuple, Tuple, Any
 
 import numpy as np
 from scipy.spatial.distance import cdist
 
-from .config import RECOGNITION_TOLERANCE, SEEN_COOLDOWN_SECONDS
+from .config import (
+    EMBEDDING_DIM,
+    MIN_EMBEDDING_CAPACITY,
+    RECOGNITION_TOLERANCE,
+    SEEN_COOLDOWN_SECONDS,
+)
 
 logger = logging.getLogger("D-Vision")
 
@@ -69,61 +75,235 @@ class Person:
         )
 
 
+class _Snapshot(NamedTuple):
+    """Immutable view of the gallery published to readers."""
+
+    people: Tuple[Person, ...]
+    matrix: Optional[np.ndarray]  # (len(people), EMBEDDING_DIM) view, or None
+
+
 class FaceDatabase:
     """
     JSON-based face embedding database.
     
     Stores face encodings and metadata for recognized individuals.
     Designed for portability and offline operation.
+
+    Embeddings live in a preallocated matrix whose capacity doubles when
+    full, so ``add_embedding`` appends a row in place (amortized O(1))
+    instead of rebuilding the whole matrix. Readers work from an immutable
+    snapshot that is swapped atomically after each write, so the
+    similarity search in ``lookup`` runs without the lock and never sees
+    a half-built matrix. Removal and update copy the matrix before
+    changing existing rows. Person fields (seen statistics, relation) are
+    only modified under the lock, so no update is lost and ``save`` never
+    serializes a half-updated person.
     
     Attributes:
         path: Path to the JSON database file.
-        people: List of Person objects in the database.
+        people: Read-only tuple of Person objects in the database.
     """
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self.people: List[Person] = []
-        self._embedding_matrix: Optional[np.ndarray] = None  # Pre-computed for fast matching
+        self._lock = threading.Lock()  # Serializes writers only
+        self._buffer: np.ndarray = np.empty(
+            (MIN_EMBEDDING_CAPACITY, EMBEDDING_DIM), dtype="float32"
+        )
+        self._snapshot = _Snapshot((), None)
+        self._revision = 0  # Bumped on every write
+        self._invalid_records: List[Any] = []  # Unloadable entries, kept on save
+        self._save_blocked = False  # Set when the file on disk is unreadable
+
+    @property
+    def people(self) -> Tuple[Person, ...]:
+        """
+        People currently in the database, as an immutable tuple.
+
+        Modify the database with ``add_embedding``, ``remove_person`` and
+        ``update_person``.
+        """
+        return self._snapshot.people
+
+    @property
+    def revision(self) -> int:
+        """Counter that changes whenever the gallery is modified."""
+        return self._revision
+
+    def __len__(self) -> int:
+        return len(self._snapshot.people)
 
     def load(self) -> None:
-        """Load database from disk. Creates empty list if file doesn't exist."""
-        if not self.path.exists():
-            self.people = []
-            self._rebuild_embedding_matrix()
-            return
-            
-        try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.people = [Person.from_dict(p) for p in data]
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error("Failed to load database: %s", e)
-            self.people = []
-        
-        self._rebuild_embedding_matrix()
+        """
+        Load database from disk. Creates empty list if file doesn't exist.
+
+        Entries that cannot be loaded (missing fields, wrong embedding
+        length) are skipped with a warning and written back unchanged by
+        ``save``. If the file itself cannot be parsed, saving is disabled
+        so the original file is never overwritten.
+        """
+        people: List[Person] = []
+        invalid: List[Any] = []
+        self._save_blocked = False
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, list):
+                    raise ValueError("expected a list of people")
+            except (json.JSONDecodeError, ValueError) as e:
+                logger.error(
+                    "Failed to load database %s: %s (saving disabled)", self.path, e
+                )
+                data = []
+                self._save_blocked = True
+
+            for i, record in enumerate(data):
+                try:
+                    person = Person.from_dict(record)
+                    self._check_embedding(person.embedding)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning("Skipping database entry %d: %s", i, e)
+                    invalid.append(record)
+                    continue
+                people.append(person)
+
+        with self._lock:
+            self._invalid_records = invalid
+            self._rebuild_embedding_matrix(people)
 
-    def _rebuild_embedding_matrix(self) -> None:
-        """Pre-compute embedding matrix for vectorized matching."""
-        if self.people:
-            self._embedding_matrix = np.array(
-                [p.embedding for p in self.people], dtype="float32"
+    def _rebuild_embedding_matrix(self, people: List[Person]) -> None:
+        """
+        Copy embeddings into a fresh buffer and publish a new snapshot.
+
+        Used for bulk loads and for writes that touch existing rows; the
+        old buffer is left untouched so in-flight readers stay consistent.
+        Caller must hold ``_lock``.
+        """
+        count = len(people)
+        capacity = max(MIN_EMBEDDING_CAPACITY, 1 << max(count - 1, 0).bit_length())
+        buffer = np.empty((capacity, EMBEDDING_DIM), dtype="float32")
+        if people:
+            buffer[:count] = np.array([p.embedding for p in people], dtype="float32")
+        self._publish(buffer, people)
+
+    def _publish(self, buffer: np.ndarray, people: List[Person]) -> None:
+        """Atomically swap in a new snapshot. Caller must hold ``_lock``."""
+        self._buffer = buffer
+        matrix = buffer[: len(people)] if people else None
+        self._snapshot = _Snapshot(tuple(people), matrix)
+        self._revision += 1
+
+    @staticmethod
+    def _check_embedding(embedding: Any) -> np.ndarray:
+        """Flatten an embedding to float32, rejecting the wrong length."""
+        emb = np.asarray(embedding, dtype="float32").reshape(-1)
+        if emb.shape[0] != EMBEDDING_DIM:
+            raise ValueError(
+                f"Embedding must have {EMBEDDING_DIM} values, got {emb.shape[0]}"
             )
-        else:
-            self._embedding_matrix = None
+        return emb
 
     def save(self) -> None:
-        """Persist database to disk."""
+        """Persist database to disk, keeping entries that failed to load."""
+        if self._save_blocked:
+            logger.error("Not saving: %s could not be loaded", self.path)
+            return
+        with self._lock:
+            data = [p.to_dict() for p in self._snapshot.people]
+            data.extend(self._invalid_records)
         with open(self.path, "w", encoding="utf-8") as f:
-            json.dump([p.to_dict() for p in self.people], f, indent=2)
+            json.dump(data, f, indent=2)
 
     def add_embedding(
         self, name: str, embedding: np.ndarray, relation: str = ""
-    ) -> None:
-        """Add a new person to the database."""
-        emb = np.array(embedding, dtype="float32")
-        self.people.append(Person(name, emb, relation))
-        self._rebuild_embedding_matrix()  # Keep matrix in sync
+    ) -> Person:
+        """
+        Add a new person to the database.
+
+        Appends the embedding into the next free row of the matrix, doubling
+        capacity when the buffer is full. Rows past the published snapshot
+        are never read, so writing them in place is safe for readers.
+
+        Raises:
+            ValueError: If the embedding is not EMBEDDING_DIM values long.
+        """
+        emb = self._check_embedding(embedding)
+        person = Person(name, emb, relation)
+
+        with self._lock:
+            people = list(self._snapshot.people)
+            count = len(people)
+            buffer = self._buffer
+            if count >= buffer.shape[0]:
+                buffer = np.empty((buffer.shape[0] * 2, EMBEDDING_DIM), dtype="float32")
+                buffer[:count] = self._buffer[:count]
+            buffer[count] = emb
+            people.append(person)
+            self._publish(buffer, people)
+
+        return person
+
+    def remove_person(self, name: str) -> bool:
+        """
+        Remove a person from the database by name.
+
+        Returns:
+            True if a matching person was found and removed.
+        """
+        with self._lock:
+            people = list(self._snapshot.people)
+            idx = self._index_of(people, name)
+            if idx is None:
+                return False
+            del people[idx]
+            self._rebuild_embedding_matrix(people)
+        return True
+
+    def update_person(
+        self,
+        name: str,
+        embedding: Optional[np.ndarray] = None,
+        relation: Optional[str] = None,
+    ) -> bool:
+        """
+        Replace a person's embedding and/or relation.
+
+        The Person object is updated in place under the lock, so seen
+        statistics recorded by concurrent lookups are kept. A new
+        embedding is written to a copy of the matrix, leaving readers of
+        the previous snapshot unaffected.
+
+        Returns:
+            True if a matching person was found and updated.
+
+        Raises:
+            ValueError: If the embedding is not EMBEDDING_DIM values long.
+        """
+        emb = None if embedding is None else self._check_embedding(embedding)
+        with self._lock:
+            people = list(self._snapshot.people)
+            idx = self._index_of(people, name)
+            if idx is None:
+                return False
+            person = people[idx]
+            if relation is not None:
+                person.relation = relation
+            if emb is not None:
+                person.embedding = emb.tolist()
+                self._rebuild_embedding_matrix(people)
+            else:
+                self._revision += 1
+        return True
+
+    @staticmethod
+    def _index_of(people: List[Person], name: str) -> Optional[int]:
+        """Return the index of the first person with ``name``, or None."""
+        for i, person in enumerate(people):
+            if person.name == name:
+                return i
+        return None
 
     def lookup(
         self, encoding: np.ndarray, tolerance: float = RECOGNITION_TOLERANCE
@@ -133,6 +313,8 @@ class FaceDatabase:
         
         Uses vectorized cosine similarity (cdist) for O(1) batch matching
         instead of O(n) loop. Significant speedup for large databases.
+        Safe to call from worker threads while enrollment is in progress:
+        the search is lock-free and only the seen-count update locks.
         
         Args:
             encoding: 128-dimensional face encoding to match.
@@ -141,30 +323,32 @@ class FaceDatabase:
         Returns:
             Tuple of (matched Person or None, confidence score).
         """
-        if self._embedding_matrix is None or len(self.people) == 0:
+        people, matrix = self._snapshot  # Single read: consistent pair
+        if matrix is None or len(people) == 0:
             return None, 0.0
 
         # Vectorized cosine similarity: 1 - cdist gives similarity
         encoding = np.array(encoding, dtype="float32").reshape(1, -1)
-        distances = cdist(encoding, self._embedding_matrix, metric="cosine")[0]
+        distances = cdist(encoding, matrix, metric="cosine")[0]
         similarities = np.maximum(0.0, 1.0 - distances)
         
         best_idx = int(np.argmax(similarities))
         best_conf = round(float(similarities[best_idx]), 2)
-        best_person = self.people[best_idx]
+        best_person = people[best_idx]
 
         if best_conf >= tolerance:
             now = datetime.now()
             
-            # Update seen count with cooldown to prevent spam
-            if best_person.last_seen is None:
-                best_person.seen_count += 1
-            else:
-                last = datetime.fromisoformat(best_person.last_seen)
-                if now - last > timedelta(seconds=SEEN_COOLDOWN_SECONDS):
+            with self._lock:
+                # Update seen count with cooldown to prevent spam
+                if best_person.last_seen is None:
                     best_person.seen_count += 1
+                else:
+                    last = datetime.fromisoformat(best_person.last_seen)
+                    if now - last > timedelta(seconds=SEEN_COOLDOWN_SECONDS):
+                        best_person.seen_count += 1
 
-            best_person.last_seen = now.isoformat(timespec="minutes")
+                best_person.last_seen = now.isoformat(timespec="minutes")
             return best_person, best_conf
 
         return None, best_conf
@@ -0,0 +1,218 @@
+"""
+Batched face encoding for D-Vision.
+
+Extracts aligned face chips and runs them through dlib's descriptor
+network in batches, so the network cost is shared across all faces in a
+frame and, when frames are submitted asynchronously, across frames.
+Produces the same embeddings as ``face_recognition.face_encodings``.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import dlib
+import numpy as np
+from face_recognition import api as fr_api
+
+from .config import ENCODING_MAX_BATCH_SIZE, ENCODING_MAX_WAIT_MS
+
+logger = logging.getLogger("D-Vision")
+
+# Chip geometry expected by dlib's ResNet face descriptor model
+FACE_CHIP_SIZE: int = 150
+FACE_CHIP_PADDING: float = 0.25
+
+FaceLocation = Tuple[int, int, int, int]  # (top, right, bottom, left)
+FaceEncoding = np.ndarray  # 128-dimensional float array
+
+_Job = Tuple[List[np.ndarray], "Future[List[FaceEncoding]]"]
+
+
+class BatchEncoder:
+    """
+    Aligned-chip face encoder with batched descriptor computation.
+
+    ``encode`` batches the faces of a single frame and returns at once.
+    ``submit`` queues a frame's chips for a background worker, which
+    gathers chips from consecutive frames until ``max_batch_size`` chips
+    are ready or ``max_wait_ms`` has passed since the first one arrived.
+    Each frame's future resolves to its embeddings in box order.
+
+    Attributes:
+        max_batch_size: Maximum chips per descriptor network call.
+        max_wait_ms: Longest a queued chip waits for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = ENCODING_MAX_BATCH_SIZE,
+        max_wait_ms: float = ENCODING_MAX_WAIT_MS,
+    ) -> None:
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()  # Guards worker start/stop
+        self._model_lock = threading.Lock()  # dlib models are not thread-safe
+
+    @staticmethod
+    def extract_chips(
+        rgb: np.ndarray, face_locations: Sequence[FaceLocation]
+    ) -> List[np.ndarray]:
+        """
+        Align and crop each face using 5-point landmarks.
+
+        Args:
+            rgb: RGB image (numpy array).
+            face_locations: Face boxes as (top, right, bottom, left).
+
+        Returns:
+            One FACE_CHIP_SIZE x FACE_CHIP_SIZE RGB chip per box.
+        """
+        chips = []
+        for top, right, bottom, left in face_locations:
+            rect = dlib.rectangle(left, top, right, bottom)
+            shape = fr_api.pose_predictor_5_point(rgb, rect)
+            chips.append(
+                dlib.get_face_chip(
+                    rgb, shape, size=FACE_CHIP_SIZE, padding=FACE_CHIP_PADDING
+                )
+            )
+        return chips
+
+    def encode_chips(self, chips: Sequence[np.ndarray]) -> List[FaceEncoding]:
+        """Compute descriptors for chips in batches of ``max_batch_size``."""
+        encodings: List[FaceEncoding] = []
+        for start in range(0, len(chips), self.max_batch_size):
+            batch = list(chips[start:start + self.max_batch_size])
+            with self._model_lock:
+                descriptors = fr_api.face_encoder.compute_face_descriptor(batch)
+            encodings.extend(np.array(d) for d in descriptors)
+        return encodings
+
+    def encode(
+        self, rgb: np.ndarray, face_locations: Sequence[FaceLocation]
+    ) -> List[FaceEncoding]:
+        """Encode all faces in one frame synchronously, in box order."""
+        if not face_locations:
+            return []
+        return self.encode_chips(self.extract_chips(rgb, face_locations))
+
+    def submit(
+        self, rgb: np.ndarray, face_locations: Sequence[FaceLocation]
+    ) -> "Future[List[FaceEncoding]]":
+        """
+        Queue a frame's faces for batched encoding across frames.
+
+        Chips are extracted immediately, so the frame may be reused as
+        soon as this returns.
+
+        Returns:
+            Future resolving to the frame's embeddings in box order.
+        """
+        future: "Future[List[FaceEncoding]]" = Future()
+        if not face_locations:
+            future.set_result([])
+            return future
+
+        chips = self.extract_chips(rgb, face_locations)
+        with self._worker_lock:
+            self._ensure_worker()
+            self._queue.put((chips, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the background worker after pending frames are encoded."""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join()
+                self._worker = None
+
+    def benchmark(
+        self, chips: Sequence[np.ndarray], max_batch_size: int, repeats: int = 3
+    ) -> Dict[int, float]:
+        """
+        Measure encoding throughput for batch sizes 1 through N.
+
+        Args:
+            chips: Sample aligned chips; cycled to fill larger batches.
+            max_batch_size: Largest batch size (N) to measure.
+            repeats: Timed runs per batch size (best run is kept).
+
+        Returns:
+            Mapping of batch size to faces encoded per second.
+        """
+        if not chips:
+            return {}
+
+        results: Dict[int, float] = {}
+        for size in range(1, max_batch_size + 1):
+            batch = [chips[i % len(chips)] for i in range(size)]
+            with self._model_lock:
+                fr_api.face_encoder.compute_face_descriptor(batch)  # Warm-up
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    fr_api.face_encoder.compute_face_descriptor(batch)
+                    best = min(best, time.perf_counter() - start)
+            results[size] = size / best if best > 0 else float("inf")
+        return results
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if needed. Caller must hold ``_worker_lock``."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="dvision-encoder", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop: gather queued frames into batches and encode them."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            jobs = [job]
+            pending = len(job[0])
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            stop = False
+
+            while pending < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                jobs.append(nxt)
+                pending += len(nxt[0])
+
+            self._encode_jobs(jobs)
+            if stop:
+                return
+
+    def _encode_jobs(self, jobs: List[_Job]) -> None:
+        """Encode the chips of several frames together and split results."""
+        chips = [chip for frame_chips, _ in jobs for chip in frame_chips]
+        try:
+            encodings = self.encode_chips(chips)
+        except Exception as e:  # Surface dlib errors to every waiting caller
+            logger.error("Batch encoding failed: %s", e)
+            for _, future in jobs:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for frame_chips, future in jobs:
+            future.set_result(encodings[offset:offset + len(frame_chips)])
+            offset += len(frame_chips)
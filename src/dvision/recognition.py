@@ -5,16 +5,28 @@ Uses MediaPipe for fast face detection and dlib (via face_recognition)
 for generating 128-dimensional face embeddings.
 """
 
+import math
+from concurrent.futures import Future
+
 import cv2
 import mediapipe as mp
-import face_recognition
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from .config import (
+    ROI_DETECTION_ENABLED,
+    ROI_FULL_SWEEP_INTERVAL,
+    ROI_MOSAIC_COLUMNS,
+    ROI_PADDING,
+    ROI_TILE_SIZE,
+)
+from .encoding import BatchEncoder
 
 
 # Type aliases for clarity
 FaceLocation = Tuple[int, int, int, int]  # (top, right, bottom, left)
 FaceEncoding = np.ndarray  # 128-dimensional float array
+Region = Tuple[int, int, int]  # (top, left, size) square crop in frame pixels
 
 
 class FaceRecognizer:
@@ -22,17 +34,84 @@ class FaceRecognizer:
     Hybrid face detection and encoding pipeline.
     
     Uses MediaPipe for fast GPU-accelerated face detection, then
-    dlib for generating robust face embeddings.
+    dlib for generating robust face embeddings. Faces are encoded as
+    aligned chips in batches (see ``BatchEncoder``).
+
+    With ROI detection enabled, most passes only search padded square
+    regions around the previous pass's faces. The crops are resized to
+    ``roi_tile_size`` and tiled into mosaics of at most
+    ``roi_mosaic_columns`` squared tiles, so several regions share one
+    detector call without shrinking below the model's input resolution.
+    Cost scales with face count rather than frame area.
+    A full-frame sweep runs every ``full_sweep_interval`` passes, when
+    there are no previous faces, or when any region loses its face.
     
     Note for Pi Zero 2 W: Consider reducing min_detection_confidence
     or switching to a lighter model for better performance.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        roi_detection: bool = ROI_DETECTION_ENABLED,
+        full_sweep_interval: int = ROI_FULL_SWEEP_INTERVAL,
+        roi_padding: float = ROI_PADDING,
+        roi_tile_size: int = ROI_TILE_SIZE,
+        roi_mosaic_columns: int = ROI_MOSAIC_COLUMNS,
+    ) -> None:
         self.detector = mp.solutions.face_detection.FaceDetection(
             model_selection=1,  # 0 = short-range, 1 = full-range
             min_detection_confidence=0.6,
         )
+        self.roi_detection = roi_detection
+        self.full_sweep_interval = max(1, full_sweep_interval)
+        self.roi_padding = roi_padding
+        self.roi_tile_size = roi_tile_size
+        self.roi_mosaic_columns = max(1, roi_mosaic_columns)
+
+        # Short-range model suits ROI tiles, where faces fill most of the crop
+        self.roi_detector = (
+            mp.solutions.face_detection.FaceDetection(
+                model_selection=0,
+                min_detection_confidence=0.6,
+            )
+            if roi_detection
+            else None
+        )
+        self._prev_boxes: List[FaceLocation] = []
+        self._passes_since_sweep = 0
+        self.encoder = BatchEncoder()
+
+    def reset_tracking(self) -> None:
+        """Forget previous faces so the next pass does a full-frame sweep."""
+        self._prev_boxes = []
+        self._passes_since_sweep = 0
+
+    def detect_faces(self, rgb: np.ndarray) -> List[FaceLocation]:
+        """
+        Detect faces in an RGB frame, using ROI search when possible.
+
+        Args:
+            rgb: Contiguous RGB image (numpy array).
+
+        Returns:
+            List of face bounding boxes in frame coordinates.
+        """
+        boxes: Optional[List[FaceLocation]] = None
+
+        if (
+            self.roi_detection
+            and self._prev_boxes
+            and self._passes_since_sweep < self.full_sweep_interval
+        ):
+            boxes = self._detect_in_regions(rgb, self._prev_boxes)
+            self._passes_since_sweep += 1
+
+        if boxes is None:
+            boxes = self._detect_full_frame(rgb)
+            self._passes_since_sweep = 1
+
+        self._prev_boxes = boxes
+        return boxes
 
     def encode_faces(
         self, bgr_frame: np.ndarray
@@ -49,11 +128,47 @@ class FaceRecognizer:
         """
         rgb = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
         rgb = np.ascontiguousarray(rgb)
-        results = self.detector.process(rgb)
 
-        face_locations: List[FaceLocation] = []
+        face_locations = self.detect_faces(rgb)
         encodings: List[FaceEncoding] = []
 
+        if face_locations:
+            # Generate embeddings using dlib, all faces in one batch
+            encodings = self.encoder.encode(rgb, face_locations)
+
+        return face_locations, encodings
+
+    def submit_faces(
+        self, bgr_frame: np.ndarray
+    ) -> Tuple[List[FaceLocation], "Future[List[FaceEncoding]]"]:
+        """
+        Detect faces now and queue them for batched encoding across frames.
+
+        For callers that queue several frames before collecting results
+        (e.g. offline enrollment from recorded video), so their faces share
+        descriptor batches. The live recognition loop uses the synchronous
+        ``encode_faces`` to avoid drawing overlays a pass late.
+
+        Args:
+            bgr_frame: OpenCV BGR image (numpy array).
+
+        Returns:
+            Tuple of (face_locations, future of encodings in box order).
+        """
+        rgb = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
+        rgb = np.ascontiguousarray(rgb)
+        face_locations = self.detect_faces(rgb)
+        return face_locations, self.encoder.submit(rgb, face_locations)
+
+    def close(self) -> None:
+        """Release background encoding resources."""
+        self.encoder.close()
+
+    def _detect_full_frame(self, rgb: np.ndarray) -> List[FaceLocation]:
+        """Run the full-range detector over the whole frame."""
+        results = self.detector.process(rgb)
+
+        face_locations: List[FaceLocation] = []
         if results.detections:
             h, w, _ = rgb.shape
             
@@ -65,8 +180,111 @@ class FaceRecognizer:
                 right = int((box.xmin + box.width) * w)
                 face_locations.append((top, right, bottom, left))
 
-            # Generate embeddings using dlib (via face_recognition)
-            encodings = face_recognition.face_encodings(rgb, face_locations)
+        return face_locations
+
+    def _detect_in_regions(
+        self, rgb: np.ndarray, prev_boxes: List[FaceLocation]
+    ) -> Optional[List[FaceLocation]]:
+        """
+        Search padded regions around previous faces, batched into mosaics.
+
+        Returns:
+            Face boxes in frame coordinates, or None if any region lost
+            its face (caller should fall back to a full-frame sweep).
+        """
+        h, w, _ = rgb.shape
+        regions = [self._region_around(box, h, w) for box in prev_boxes]
+        per_call = self.roi_mosaic_columns ** 2
+
+        face_locations: List[FaceLocation] = []
+        for start in range(0, len(regions), per_call):
+            found = self._detect_in_mosaic(rgb, regions[start:start + per_call])
+            if found is None:
+                return None
+            for loc in found:
+                # Overlapping regions can see the same face twice
+                if all(_iou(loc, other) <= 0.5 for other in face_locations):
+                    face_locations.append(loc)
+
+        return face_locations
+
+    def _detect_in_mosaic(
+        self, rgb: np.ndarray, regions: List[Region]
+    ) -> Optional[List[FaceLocation]]:
+        """
+        Tile up to ``roi_mosaic_columns`` squared regions and detect once.
+
+        Returns:
+            Face boxes in frame coordinates, or None if any region in the
+            mosaic has no detection.
+        """
+        tile = self.roi_tile_size
+        cols = math.ceil(math.sqrt(len(regions)))
+        size_px = cols * tile
+
+        mosaic = np.zeros((size_px, size_px, 3), dtype=rgb.dtype)
+        for i, (top, left, size) in enumerate(regions):
+            r, c = divmod(i, cols)
+            crop = rgb[top:top + size, left:left + size]
+            mosaic[r * tile:(r + 1) * tile, c * tile:(c + 1) * tile] = cv2.resize(
+                crop, (tile, tile), interpolation=cv2.INTER_AREA
+            )
+
+        results = self.roi_detector.process(mosaic)
+        if not results.detections:
+            return None
+
+        found = [False] * len(regions)
+        face_locations: List[FaceLocation] = []
+
+        for det in results.detections:
+            box = det.location_data.relative_bounding_box
+            x0, y0 = box.xmin * size_px, box.ymin * size_px
+            x1, y1 = x0 + box.width * size_px, y0 + box.height * size_px
+
+            # Assign the detection to the tile containing its center
+            c = min(cols - 1, max(0, int((x0 + x1) / 2 // tile)))
+            r = min(cols - 1, max(0, int((y0 + y1) / 2 // tile)))
+            i = r * cols + c
+            if i >= len(regions):
+                continue  # Blank padding tile
+
+            top, left, size = regions[i]
+            scale = size / tile
+            ox, oy = c * tile, r * tile
+            # Clip to the tile, then map back to frame coordinates
+            tx0, tx1 = (min(max(x - ox, 0.0), tile) for x in (x0, x1))
+            ty0, ty1 = (min(max(y - oy, 0.0), tile) for y in (y0, y1))
+            face_locations.append((
+                top + int(ty0 * scale),
+                left + int(tx1 * scale),
+                top + int(ty1 * scale),
+                left + int(tx0 * scale),
+            ))
+            found[i] = True
+
+        if not all(found):
+            return None
+        return face_locations
+
+    def _region_around(self, box: FaceLocation, h: int, w: int) -> Region:
+        """Padded square region around a face box, clamped to the frame."""
+        top, right, bottom, left = box
+        side = max(bottom - top, right - left, 1)
+        size = min(int(side * (1 + 2 * self.roi_padding)), h, w)
+        cy, cx = (top + bottom) // 2, (left + right) // 2
+        region_top = min(max(cy - size // 2, 0), h - size)
+        region_left = min(max(cx - size // 2, 0), w - size)
+        return region_top, region_left, size
 
-        return face_locations, encodings
 
+def _iou(a: FaceLocation, b: FaceLocation) -> float:
+    """Intersection-over-union of two (top, right, bottom, left) boxes."""
+    inter_h = min(a[2], b[2]) - max(a[0], b[0])
+    inter_w = min(a[1], b[1]) - max(a[3], b[3])
+    if inter_h <= 0 or inter_w <= 0:
+        return 0.0
+    inter = inter_h * inter_w
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    return inter / float(area_a + area_b - inter)
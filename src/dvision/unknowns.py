@@ -0,0 +1,261 @@
+"""
+Unknown-face cache for D-Vision.
+
+Remembers recent embeddings that failed to match the database and groups
+them with online clustering. A stranger who stays in view matches their
+own cluster, so the full gallery search is skipped on most later frames.
+Clusters seen often enough double as candidate enrollments.
+"""
+
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from .config import (
+    RECOGNITION_TOLERANCE,
+    UNKNOWN_CACHE_SIZE,
+    UNKNOWN_CACHE_TTL_SECONDS,
+    UNKNOWN_CLUSTER_TOLERANCE,
+    UNKNOWN_MIN_SIGHTINGS,
+)
+from .database import FaceDatabase, Person
+
+
+class UnknownCluster:
+    """
+    A group of similar unmatched face embeddings.
+
+    Attributes:
+        cluster_id: Stable identifier used when naming clusters.
+        centroid: Running mean of the verified member embeddings.
+        count: Number of verified embeddings in the centroid.
+        sightings: Times the face was seen, including cache hits.
+        best_conf: Highest database confidence seen for this face.
+        last_seen: Monotonic timestamp of the most recent sighting.
+        verified_at: Monotonic timestamp of the last full database lookup.
+        revision: Database revision the cluster was last verified against.
+    """
+
+    def __init__(
+        self,
+        cluster_id: int,
+        embedding: np.ndarray,
+        best_conf: float,
+        now: float,
+        revision: int,
+    ) -> None:
+        self.cluster_id = cluster_id
+        self.centroid = np.array(embedding, dtype="float32").reshape(-1)
+        self.count = 1
+        self.sightings = 1
+        self.best_conf = best_conf
+        self.last_seen = now
+        self.verified_at = now
+        self.revision = revision
+
+    def absorb(self, embedding: np.ndarray, now: float) -> None:
+        """Fold a verified embedding into the running-mean centroid."""
+        self.count += 1
+        self.sightings += 1
+        self.centroid += (embedding - self.centroid) / self.count
+        self.last_seen = now
+        self.verified_at = now
+
+
+class UnknownFaceCache:
+    """
+    Bounded, TTL-evicted cache of unmatched face embeddings.
+
+    A cluster short-circuits the gallery search only while all of these
+    hold, so one failed lookup cannot hide an enrolled person for long:
+
+    - a full database lookup confirmed it within the last ``ttl`` seconds
+      (hits do not extend this, so the database is searched at least
+      once per ``ttl`` while the face stays in view);
+    - the database revision it was verified against is still current;
+    - its best database confidence is low enough that nothing within
+      ``tolerance`` of the cluster could reach ``recognition_tolerance``
+      (see ``max_short_circuit_conf``).
+
+    Cache hits are counted as sightings but never folded into the
+    centroid, since they were not checked against the database.
+
+    Clusters not seen for ``ttl`` seconds with fewer than ``min_sightings``
+    sightings are evicted; the rest are kept as enrollment candidates until
+    the size bound pushes them out (least recently seen first).
+    """
+
+    def __init__(
+        self,
+        tolerance: float = UNKNOWN_CLUSTER_TOLERANCE,
+        ttl: float = UNKNOWN_CACHE_TTL_SECONDS,
+        max_size: int = UNKNOWN_CACHE_SIZE,
+        min_sightings: int = UNKNOWN_MIN_SIGHTINGS,
+        recognition_tolerance: float = RECOGNITION_TOLERANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.tolerance = tolerance
+        self.ttl = ttl
+        self.max_size = max_size
+        self.min_sightings = min_sightings
+        self.recognition_tolerance = recognition_tolerance
+        self._clock = clock
+        self._clusters: Dict[int, UnknownCluster] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    @property
+    def max_short_circuit_conf(self) -> float:
+        """
+        Highest cluster ``best_conf`` that may skip the gallery search.
+
+        A hit lies within angle ``arccos(tolerance)`` of the cluster, so by
+        the triangle inequality on angles it can be at most that much
+        closer to any enrolled person than the cluster was. Requiring
+        ``arccos(best_conf) > arccos(recognition_tolerance) + arccos(tolerance)``
+        keeps every hit below ``recognition_tolerance``. Lookup confidences
+        are rounded to 2 decimals, so half a step of slack is subtracted.
+        """
+        angle = math.acos(self.recognition_tolerance) + math.acos(self.tolerance)
+        return math.cos(min(angle, math.pi)) - 0.005
+
+    def match(
+        self, encoding: np.ndarray, revision: int
+    ) -> Optional[UnknownCluster]:
+        """
+        Return the verified cluster this encoding belongs to, if any.
+
+        A hit counts as a sighting but does not change the centroid or
+        extend the verification window.
+
+        Args:
+            encoding: 128-dimensional face encoding.
+            revision: Current ``FaceDatabase.revision``.
+        """
+        now = self._clock()
+        max_conf = self.max_short_circuit_conf
+        with self._lock:
+            self._evict(now)
+            active = [
+                c for c in self._clusters.values()
+                if c.revision == revision
+                and now - c.verified_at <= self.ttl
+                and c.best_conf < max_conf
+            ]
+            cluster = self._nearest(encoding, active)
+            if cluster is not None:
+                cluster.sightings += 1
+                cluster.last_seen = now
+            return cluster
+
+    def add(
+        self, encoding: np.ndarray, conf: float, revision: int
+    ) -> UnknownCluster:
+        """
+        Record an encoding that failed a full database lookup.
+
+        Joins the nearest cluster (active or candidate) within tolerance,
+        otherwise starts a new one.
+
+        Args:
+            encoding: 128-dimensional face encoding.
+            conf: Best database confidence returned by the lookup.
+            revision: ``FaceDatabase.revision`` the lookup ran against.
+        """
+        now = self._clock()
+        emb = np.asarray(encoding, dtype="float32").reshape(-1)
+        with self._lock:
+            cluster = self._nearest(emb, list(self._clusters.values()))
+            if cluster is None:
+                cluster = UnknownCluster(next(self._ids), emb, conf, now, revision)
+                self._clusters[cluster.cluster_id] = cluster
+            else:
+                cluster.absorb(emb, now)
+                cluster.best_conf = max(cluster.best_conf, conf)
+                cluster.revision = revision
+            self._evict(now)
+            return cluster
+
+    def candidates(self, min_sightings: Optional[int] = None) -> List[UnknownCluster]:
+        """Clusters seen often enough to enroll, most frequent first."""
+        threshold = self.min_sightings if min_sightings is None else min_sightings
+        with self._lock:
+            found = [c for c in self._clusters.values() if c.sightings >= threshold]
+        return sorted(found, key=lambda c: c.sightings, reverse=True)
+
+    def enroll(
+        self,
+        db: FaceDatabase,
+        names: Dict[int, str],
+        relations: Optional[Dict[int, str]] = None,
+    ) -> List[Person]:
+        """
+        Add named clusters to the database in bulk.
+
+        Each cluster's centroid becomes the new person's embedding, and
+        enrolled clusters are dropped from the cache. Clusters given a
+        blank name are left in place.
+
+        Args:
+            db: FaceDatabase to enroll into.
+            names: Mapping of cluster_id to person name.
+            relations: Optional mapping of cluster_id to relation.
+
+        Returns:
+            The newly added Person objects.
+        """
+        relations = relations or {}
+        added: List[Person] = []
+        for cluster_id, name in names.items():
+            if not name:
+                continue
+            with self._lock:
+                cluster = self._clusters.pop(cluster_id, None)
+            if cluster is None:
+                continue
+            added.append(
+                db.add_embedding(name, cluster.centroid, relations.get(cluster_id, ""))
+            )
+        return added
+
+    def clear(self) -> None:
+        """Drop all clusters."""
+        with self._lock:
+            self._clusters.clear()
+
+    def _nearest(
+        self, encoding: np.ndarray, clusters: List[UnknownCluster]
+    ) -> Optional[UnknownCluster]:
+        """Closest cluster within tolerance, or None."""
+        if not clusters:
+            return None
+        centroids = np.stack([c.centroid for c in clusters])
+        encoding = np.asarray(encoding, dtype="float32").reshape(1, -1)
+        similarities = 1.0 - cdist(encoding, centroids, metric="cosine")[0]
+        best_idx = int(np.argmax(similarities))
+        if similarities[best_idx] >= self.tolerance:
+            return clusters[best_idx]
+        return None
+
+    def _evict(self, now: float) -> None:
+        """Apply TTL and size bounds. Caller must hold ``_lock``."""
+        for cluster_id, c in list(self._clusters.items()):
+            if now - c.last_seen > self.ttl and c.sightings < self.min_sightings:
+                del self._clusters[cluster_id]
+
+        if len(self._clusters) > self.max_size:
+            # Sporadic clusters go first, then least recently seen
+            ranked = sorted(
+                self._clusters.values(),
+                key=lambda c: (c.sightings >= self.min_sightings, c.last_seen),
+            )
+            for c in ranked[: len(self._clusters) - self.max_size]:
+                del self._clusters[c.cluster_id]
@@ -0,0 +1,142 @@
+"""Tests for the FaceDatabase embedding store."""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from dvision.config import EMBEDDING_DIM, MIN_EMBEDDING_CAPACITY
+from dvision.database import FaceDatabase
+
+
+def _embeddings(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, EMBEDDING_DIM))
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = FaceDatabase(tmp_path / "face_db.json")
+    database.load()
+    return database
+
+
+def test_add_grows_capacity_by_doubling(db):
+    embs = _embeddings(MIN_EMBEDDING_CAPACITY + 1)
+    for i, emb in enumerate(embs[:MIN_EMBEDDING_CAPACITY]):
+        db.add_embedding(f"p{i}", emb)
+    buffer = db._buffer
+    assert buffer.shape[0] == MIN_EMBEDDING_CAPACITY
+
+    db.add_embedding("last", embs[-1])
+    assert db._buffer.shape[0] == 2 * MIN_EMBEDDING_CAPACITY
+    assert len(db) == MIN_EMBEDDING_CAPACITY + 1
+    assert db.lookup(embs[-1])[0].name == "last"
+
+
+def test_add_rejects_wrong_length(db):
+    with pytest.raises(ValueError, match=str(EMBEDDING_DIM)):
+        db.add_embedding("bad", np.ones(EMBEDDING_DIM + 1))
+    assert len(db) == 0
+
+
+def test_remove_person(db):
+    embs = _embeddings(3)
+    for i, emb in enumerate(embs):
+        db.add_embedding(f"p{i}", emb)
+
+    assert db.remove_person("p1")
+    assert not db.remove_person("p1")
+    assert [p.name for p in db.people] == ["p0", "p2"]
+    assert db.lookup(embs[1])[0] is None
+    assert db.lookup(embs[2])[0].name == "p2"
+
+
+def test_update_person_keeps_seen_stats(db):
+    embs = _embeddings(2)
+    db.add_embedding("alice", embs[0])
+    person, _ = db.lookup(embs[0])
+    assert person.seen_count == 1
+
+    revision = db.revision
+    assert db.update_person("alice", embedding=embs[1], relation="Sister")
+    assert db.revision != revision
+    assert person.relation == "Sister"
+    assert person.seen_count == 1
+    assert db.lookup(embs[1])[0] is person
+    assert not db.update_person("bob", relation="Friend")
+
+
+def test_people_is_read_only(db):
+    db.add_embedding("alice", _embeddings(1)[0])
+    with pytest.raises(AttributeError):
+        db.people.append(None)
+
+
+def test_save_and_load_round_trip(db):
+    embs = _embeddings(3)
+    for i, emb in enumerate(embs):
+        db.add_embedding(f"p{i}", emb, relation="Friend")
+    db.save()
+
+    loaded = FaceDatabase(db.path)
+    loaded.load()
+    assert [p.name for p in loaded.people] == ["p0", "p1", "p2"]
+    assert loaded.lookup(embs[2])[0].name == "p2"
+
+
+def test_bad_entry_survives_load_save_round_trip(tmp_path):
+    path = tmp_path / "face_db.json"
+    good = {"name": "ok", "embedding": [0.1] * EMBEDDING_DIM}
+    bad = {"name": "old", "embedding": [0.1] * (EMBEDDING_DIM - 1)}
+    path.write_text(json.dumps([good, bad]))
+
+    db = FaceDatabase(path)
+    db.load()
+    assert [p.name for p in db.people] == ["ok"]
+    db.save()
+
+    saved = json.loads(path.read_text())
+    assert [r["name"] for r in saved] == ["ok", "old"]
+    assert saved[1] == bad
+
+
+def test_unparseable_file_is_not_overwritten(tmp_path):
+    path = tmp_path / "face_db.json"
+    path.write_text("{not json")
+
+    db = FaceDatabase(path)
+    db.load()
+    db.add_embedding("new", _embeddings(1)[0])
+    db.save()
+
+    assert len(db) == 1
+    assert path.read_text() == "{not json"
+
+
+def test_lookup_during_concurrent_enrollment(db):
+    embs = _embeddings(200)
+    db.add_embedding("p0", embs[0])
+    errors = []
+    stop = threading.Event()
+
+    def reader() -> None:
+        while not stop.is_set():
+            try:
+                person, _ = db.lookup(embs[0])
+                if person is None or person.name != "p0":
+                    errors.append(person)
+            except Exception as e:  # pragma: no cover - failure path
+                errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i, emb in enumerate(embs[1:], start=1):
+        db.add_embedding(f"p{i}", emb)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(db) == len(embs)
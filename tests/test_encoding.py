@@ -0,0 +1,130 @@
+"""Tests for batched face encoding."""
+
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from dvision import encoding
+from dvision.encoding import BatchEncoder
+
+
+class StubNetwork:
+    """Descriptor network stand-in: encodes each chip as its fill value."""
+
+    def __init__(self) -> None:
+        self.batch_sizes = []
+
+    def compute_face_descriptor(self, batch):
+        self.batch_sizes.append(len(batch))
+        return [np.full(128, chip[0, 0], dtype=float) for chip in batch]
+
+
+def _chip(value: int) -> np.ndarray:
+    return np.full((2, 2), value, dtype=float)
+
+
+@pytest.fixture
+def network(monkeypatch):
+    net = StubNetwork()
+    monkeypatch.setattr(encoding, "fr_api", SimpleNamespace(face_encoder=net))
+    return net
+
+
+@pytest.fixture
+def encoder(monkeypatch, network):
+    enc = BatchEncoder(max_batch_size=4, max_wait_ms=50)
+    # Boxes carry their chip value in the "left" slot
+    monkeypatch.setattr(
+        enc, "extract_chips", lambda rgb, boxes: [_chip(b[3]) for b in boxes]
+    )
+    yield enc
+    enc.close()
+
+
+def _values(encodings):
+    return [int(e[0]) for e in encodings]
+
+
+def _boxes(*values):
+    return [(0, 0, 0, v) for v in values]
+
+
+def test_encode_chips_splits_into_max_batches(encoder, network):
+    result = encoder.encode_chips([_chip(v) for v in range(10)])
+    assert _values(result) == list(range(10))
+    assert network.batch_sizes == [4, 4, 2]
+
+
+def test_encode_jobs_returns_results_per_frame_in_order(encoder, network):
+    jobs = [([_chip(v) for v in vals], Future()) for vals in ([1, 2, 3], [4], [5, 6])]
+    encoder._encode_jobs(jobs)
+
+    assert [_values(f.result()) for _, f in jobs] == [[1, 2, 3], [4], [5, 6]]
+    assert network.batch_sizes == [4, 2]
+
+
+def test_encode_jobs_propagates_errors(encoder, network):
+    network.compute_face_descriptor = lambda batch: 1 / 0
+    jobs = [([_chip(1)], Future()), ([_chip(2)], Future())]
+    encoder._encode_jobs(jobs)
+    for _, future in jobs:
+        with pytest.raises(ZeroDivisionError):
+            future.result()
+
+
+def test_submit_batches_across_frames(encoder, network):
+    frames = [_boxes(10, 11), _boxes(), _boxes(20), _boxes(30, 31, 32)]
+    futures = [encoder.submit(None, boxes) for boxes in frames]
+
+    results = [_values(f.result(timeout=5)) for f in futures]
+    assert results == [[10, 11], [], [20], [30, 31, 32]]
+    assert sum(network.batch_sizes) == 6
+    assert len(network.batch_sizes) < 3  # Frames shared network calls
+
+
+def test_default_settings_batch_queued_frames(monkeypatch, network):
+    encoder = BatchEncoder()  # ENCODING_MAX_BATCH_SIZE / ENCODING_MAX_WAIT_MS
+    monkeypatch.setattr(
+        encoder, "extract_chips", lambda rgb, boxes: [_chip(b[3]) for b in boxes]
+    )
+    try:
+        futures = [encoder.submit(None, _boxes(2 * k, 2 * k + 1)) for k in range(4)]
+        results = [_values(f.result(timeout=5)) for f in futures]
+    finally:
+        encoder.close()
+
+    assert results == [[0, 1], [2, 3], [4, 5], [6, 7]]
+    assert network.batch_sizes == [8]
+
+
+def test_concurrent_submit_starts_one_worker(encoder):
+    started = []
+    original = encoder._ensure_worker
+
+    def tracking_ensure() -> None:
+        before = encoder._worker
+        original()
+        if encoder._worker is not before:
+            started.append(encoder._worker)
+
+    encoder._ensure_worker = tracking_ensure
+    barrier = threading.Barrier(8)
+    futures = []
+
+    def submit(v: int) -> None:
+        barrier.wait()
+        futures.append(encoder.submit(None, _boxes(v)))
+
+    threads = [threading.Thread(target=submit, args=(v,)) for v in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(_values(f.result(timeout=5))[0] for f in futures) == list(range(8))
+    assert len(started) == 1
+    encoder.close()
+    assert not started[0].is_alive()
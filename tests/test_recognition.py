@@ -0,0 +1,93 @@
+"""Tests for region-of-interest face detection."""
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from dvision.recognition import FaceRecognizer, _iou
+
+
+class FakeDetector:
+    """Reports each bright square in the image as a face."""
+
+    def __init__(self) -> None:
+        self.shapes = []
+
+    def process(self, image):
+        self.shapes.append(image.shape)
+        h, w, _ = image.shape
+        mask = (image[..., 0] > 127).astype("uint8")
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        detections = [
+            SimpleNamespace(location_data=SimpleNamespace(
+                relative_bounding_box=SimpleNamespace(
+                    xmin=x / w, ymin=y / h, width=bw / w, height=bh / h
+                )
+            ))
+            for x, y, bw, bh, _ in stats[1:]
+        ]
+        return SimpleNamespace(detections=detections)
+
+
+def _frame(boxes):
+    frame = np.zeros((480, 640, 3), dtype="uint8")
+    for top, right, bottom, left in boxes:
+        frame[top:bottom, left:right] = 255
+    return frame
+
+
+@pytest.fixture
+def recognizer():
+    rec = FaceRecognizer(roi_detection=True, full_sweep_interval=10)
+    rec.detector = FakeDetector()
+    rec.roi_detector = FakeDetector()
+    return rec
+
+
+def test_iou():
+    box = (0, 10, 10, 0)
+    assert _iou(box, box) == 1.0
+    assert _iou(box, (20, 30, 30, 20)) == 0.0
+    assert _iou(box, (0, 15, 10, 5)) == pytest.approx(50 / 150)
+
+
+def test_roi_pass_maps_boxes_back_to_frame(recognizer):
+    boxes = [(100, 164, 164, 100), (300, 464, 364, 400)]
+    frame = _frame(boxes)
+
+    assert recognizer.detect_faces(frame) == boxes  # Full sweep
+    assert recognizer.detect_faces(frame) == boxes  # ROI pass
+    assert len(recognizer.detector.shapes) == 1
+    assert len(recognizer.roi_detector.shapes) == 1
+
+
+def test_roi_mosaics_keep_tile_resolution(recognizer):
+    boxes = [(20 + 150 * r, 84 + 130 * c, 84 + 150 * r, 20 + 130 * c)
+             for r in range(2) for c in range(3)]
+    frame = _frame(boxes)
+
+    recognizer.detect_faces(frame)
+    assert sorted(recognizer.detect_faces(frame)) == sorted(boxes)
+
+    max_side = recognizer.roi_mosaic_columns * recognizer.roi_tile_size
+    shapes = recognizer.roi_detector.shapes
+    assert len(shapes) == 2  # 6 faces, 4 tiles per call
+    assert all(h <= max_side and w <= max_side for h, w, _ in shapes)
+
+
+def test_lost_face_triggers_full_sweep(recognizer):
+    boxes = [(100, 164, 164, 100), (300, 464, 364, 400)]
+    recognizer.detect_faces(_frame(boxes))
+
+    assert recognizer.detect_faces(_frame(boxes[:1])) == boxes[:1]
+    assert len(recognizer.detector.shapes) == 2
+
+
+def test_periodic_full_sweep(recognizer):
+    recognizer.full_sweep_interval = 3
+    frame = _frame([(100, 164, 164, 100)])
+    for _ in range(7):
+        recognizer.detect_faces(frame)
+    assert len(recognizer.detector.shapes) == 3  # Passes 1, 4 and 7
@@ -0,0 +1,148 @@
+"""Tests for the unknown-face cache."""
+
+import numpy as np
+import pytest
+
+from dvision.app import identify
+from dvision.config import EMBEDDING_DIM
+from dvision.database import FaceDatabase
+from dvision.unknowns import UnknownFaceCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _axis(i: int) -> np.ndarray:
+    v = np.zeros(EMBEDDING_DIM, dtype="float32")
+    v[i] = 1.0
+    return v
+
+
+def _near(base: int, other: int, similarity: float) -> np.ndarray:
+    """Unit vector with the given cosine similarity to axis ``base``."""
+    return similarity * _axis(base) + np.sqrt(1 - similarity**2) * _axis(other)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return UnknownFaceCache(ttl=10, max_size=3, min_sightings=2, clock=clock)
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = FaceDatabase(tmp_path / "face_db.json")
+    database.load()
+    return database
+
+
+def test_match_requires_verified_cluster(cache):
+    assert cache.match(_axis(0), revision=1) is None
+    cluster = cache.add(_axis(0), conf=0.2, revision=1)
+
+    assert cache.match(_axis(0), revision=1) is cluster
+    assert cache.match(_axis(5), revision=1) is None
+    assert cluster.sightings == 2
+    assert cluster.count == 1  # Hits are not folded into the centroid
+
+
+def test_hits_do_not_extend_verification(cache, clock):
+    cluster = cache.add(_axis(0), conf=0.2, revision=1)
+    for _ in range(5):
+        clock.now += 3
+        hit = cache.match(_axis(0), revision=1)
+    assert hit is None  # 15s since the last full lookup
+
+    cache.add(_axis(0), conf=0.2, revision=1)
+    assert cache.match(_axis(0), revision=1) is cluster
+
+
+def test_revision_change_forces_lookup(cache):
+    cache.add(_axis(0), conf=0.2, revision=1)
+    assert cache.match(_axis(0), revision=2) is None
+
+
+def test_near_tolerance_conf_is_never_short_circuited(cache):
+    cache.add(_axis(0), conf=cache.recognition_tolerance - 0.01, revision=1)
+    assert cache.match(_axis(0), revision=1) is None
+
+
+def test_short_circuit_gate_covers_cluster_radius(cache):
+    assert cache.max_short_circuit_conf == pytest.approx(0.73, abs=0.01)
+
+    cache.add(_axis(0), conf=0.80, revision=1)
+    assert cache.match(_axis(0), revision=1) is None
+    cache.add(_axis(1), conf=0.70, revision=1)
+    assert cache.match(_axis(1), revision=1) is not None
+
+
+def test_ttl_evicts_sporadic_but_keeps_candidates(cache, clock):
+    cache.add(_axis(0), conf=0.2, revision=1)
+    frequent = cache.add(_axis(1), conf=0.2, revision=1)
+    cache.add(_axis(1), conf=0.2, revision=1)
+
+    clock.now += 11
+    assert cache.match(_axis(2), revision=1) is None  # Triggers eviction
+    assert len(cache) == 1
+    assert cache.candidates() == [frequent]
+
+
+def test_size_bound_evicts_least_recent_sporadic(cache, clock):
+    for i in range(3):
+        clock.now += 1
+        cache.add(_axis(i), conf=0.2, revision=1)
+    clock.now += 1
+    cache.add(_axis(3), conf=0.2, revision=1)
+
+    assert len(cache) == 3
+    assert cache.match(_axis(0), revision=1) is None
+    assert cache.match(_axis(3), revision=1) is not None
+
+
+def test_enroll_in_bulk(cache, db):
+    a = cache.add(_axis(0), conf=0.2, revision=db.revision)
+    b = cache.add(_axis(1), conf=0.2, revision=db.revision)
+
+    names = {a.cluster_id: "Ann", b.cluster_id: ""}
+    added = cache.enroll(db, names, {a.cluster_id: "Aunt"})
+
+    assert [(p.name, p.relation) for p in added] == [("Ann", "Aunt")]
+    assert db.lookup(_axis(0))[0].name == "Ann"
+    assert len(cache) == 1  # Blank name leaves the candidate in place
+    assert cache.candidates(min_sightings=1) == [b]
+
+
+def test_one_failed_lookup_does_not_hide_enrolled_person(db):
+    """Regression: a single miss must not make a known face unknown."""
+    cache = UnknownFaceCache(clock=FakeClock())
+    db.add_embedding("alice", _axis(0))
+
+    person, conf = identify(db, cache, _near(0, 1, 0.90))
+    assert person is None and conf == pytest.approx(0.90)
+
+    person, _ = identify(db, cache, _near(0, 1, 0.984))
+    assert person is not None and person.name == "alice"
+
+
+def test_miss_at_085_does_not_hide_enrolled_person(db):
+    """Regression: a hit within the cluster radius can still be a match."""
+    cache = UnknownFaceCache(clock=FakeClock())
+    db.add_embedding("alice", _axis(0))
+
+    person, conf = identify(db, cache, _near(0, 1, 0.85))
+    assert person is None and conf == pytest.approx(0.85)
+
+    probe = _near(0, 1, 0.97)
+    assert float(probe @ _near(0, 1, 0.85)) > cache.tolerance  # Inside cluster
+    for _ in range(3):
+        person, _ = identify(db, cache, probe)
+        assert person is not None and person.name == "alice"